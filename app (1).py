@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+
+from chart_cache import plotly_bar_spec, plotly_radar_spec
 
 # ------------------------
 # Load CSVs
@@ -70,16 +71,8 @@ if st.session_state.index >= len(df):
     # ------------------------
     st.subheader("📈 RIASEC Scores Overview")
     scores_df = pd.DataFrame(list(scores.items()), columns=["Dimension", "Score"])
-    fig = px.bar(
-        scores_df,
-        x="Dimension",
-        y="Score",
-        text="Score",
-        range_y=[0, 30],
-        color="Score",
-        color_continuous_scale="Viridis"
-    )
-    fig.update_layout(yaxis_title="Score", xaxis_title="Dimension", showlegend=False)
+    # figures are cached per score vector, so identical results skip plotly express
+    fig = plotly_bar_spec("RIASEC", scores.items(), range_y=(0, 30))
     st.plotly_chart(fig, use_container_width=True)
 
     st.markdown("---")
@@ -88,14 +81,7 @@ if st.session_state.index >= len(df):
     # Radar Chart
     # ------------------------
     st.subheader("🎯 Radar Chart")
-    fig2 = px.line_polar(
-        scores_df,
-        r="Score",
-        theta="Dimension",
-        line_close=True,
-        markers=True
-    )
-    fig2.update_traces(fill='toself')
+    fig2 = plotly_radar_spec("RIASEC", scores.items())
     st.plotly_chart(fig2, use_container_width=True)
 
     # ------------------------
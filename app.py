@@ -1,88 +1,35 @@
 # app.py
 import streamlit as st
 import pandas as pd
-import os
-from io import StringIO
+
+from chart_cache import bar_chart_spec
+from client_questionnaire import questionnaire, check_responses
+from score_utils import (
+    try_read_csv,
+    full_to_abbr,
+    normalize_riasec_df,
+    normalize_tci_df,
+    score_responses,
+)
+from upload_store import upload_store
 
 st.set_page_config(page_title="Skillbot AI — Combined Tests", layout="wide")
 
 # -----------------------
-# Utility functions
+# Local score files
 # -----------------------
 RIASEC_LOCAL_PATH = "/mnt/data/RIASEC test.csv"   # user's uploaded file path (if present)
 TCI_LOCAL_PATH = "/mnt/data/TCT test.csv"         # user's uploaded file path (if present)
 
-def try_read_csv(path):
-    try:
-        if os.path.exists(path):
-            return pd.read_csv(path)
-    except Exception:
-        return None
-    return None
-
-def safe_read(uploaded_file):
-    if uploaded_file is None:
-        return None
-    try:
-        return pd.read_csv(uploaded_file)
-    except Exception:
-        # try read as text then parse
-        text = StringIO(uploaded_file.getvalue().decode("utf-8"))
-        return pd.read_csv(text)
-
-# normalize TCI abbreviation mapping (if needed)
-abbr_to_full = {
-    "NS": "Novelty Seeking",
-    "HA": "Harm Avoidance",
-    "RD": "Reward Dependence",
-    "P":  "Persistence",
-    "SD": "Self-Directedness",
-    "C":  "Cooperativeness",
-    "ST": "Self-Transcendence"
-}
-full_to_abbr = {v: k for k, v in abbr_to_full.items()}
-
-def normalize_riasec_df(df):
-    # Accept dataframes that have either columns: Dimension, Score
-    # or two columns with letters and scores. Return DataFrame with Dimension, Score
-    if df is None:
-        return None
-    cols = [c.lower() for c in df.columns]
-    # try common names
-    if "dimension" in df.columns and "score" in df.columns:
-        out = df[["Dimension","Score"]].copy()
-    elif len(df.columns) >= 2:
-        # pick first two columns
-        out = df.iloc[:, :2].copy()
-        out.columns = ["Dimension","Score"]
-    else:
-        return None
-    # normalize Dimension values (strip)
-    out["Dimension"] = out["Dimension"].astype(str).str.strip()
-    out["Score"] = pd.to_numeric(out["Score"], errors="coerce").fillna(0).astype(int)
-    return out
-
-def normalize_tci_df(df):
-    if df is None:
-        return None
-    if "Dimension" in df.columns and "Score" in df.columns:
-        out = df[["Dimension","Score"]].copy()
-    elif len(df.columns) >= 2:
-        out = df.iloc[:, :2].copy()
-        out.columns = ["Dimension","Score"]
-    else:
-        return None
-    out["Dimension"] = out["Dimension"].astype(str).str.strip()
-    out["Score"] = pd.to_numeric(out["Score"], errors="coerce").fillna(0).astype(int)
-    # try to convert full names to abbreviations if needed
-    out["Dimension_Abbr"] = out["Dimension"].apply(lambda v: full_to_abbr.get(v, v) if isinstance(v, str) else v)
-    return out
-
 # -----------------------
 # Tabs (Option 2 style)
 # -----------------------
 tabs = st.tabs(["Home", "RIASEC Test", "TCI Test", "Dashboard", "Combined Report", "Uploads"])
 
+# Client mode ships the whole question bank to the browser and submits all
+# answers in one round trip instead of rerunning the script per question.
+client_mode = st.sidebar.checkbox("Answer the whole test in the browser (single submit)", key="client_mode")
+
 # -----------------------
 # Home
 # -----------------------
@@ -104,17 +51,13 @@ with tabs[1]:
     st.write("If you have a question file `riasec_30_questions.csv` you can upload it here, otherwise the test UI will expect questions to be provided by a CSV.")
 
     qfile = st.file_uploader("Optional: Upload RIASEC questions CSV (columns: ID, Question, Dimension)", type=["csv"], key="riasec_questions_uploader")
-    # try to load local question file if present
-    riasec_questions = safe_read(qfile) if qfile else None
+    # parsed once per distinct file content and shared across sessions
+    riasec_questions = upload_store.load(qfile, "questions") if qfile else None
     # If no questions file, show message
     if riasec_questions is None:
         st.info("No RIASEC questions file uploaded. If you want to take the questionnaire here, upload a questions CSV with columns ID, Question, Dimension.")
         st.stop()
 
-    # prepare questions
-    riasec_questions.columns = riasec_questions.columns.str.strip()
-    if "ID" not in riasec_questions.columns:
-        riasec_questions.insert(0, "ID", range(1, len(riasec_questions)+1))
     # session state for riasec
     if "riasec_idx" not in st.session_state:
         st.session_state.riasec_idx = 0
@@ -133,7 +76,24 @@ with tabs[1]:
         st.session_state.riasec_responses[st.session_state.riasec_idx] = st.session_state.get(f"riasec_q_{st.session_state.riasec_idx}", 3)
         st.session_state.riasec_idx += 1
 
-    if st.session_state.riasec_idx < len(riasec_questions):
+    if client_mode:
+        responses = questionnaire("RIASEC", riasec_questions, options, "How much would you enjoy this activity?", key="riasec_client")
+        if responses is None:
+            st.caption("Your answers stay in the browser until you submit.")
+        else:
+            try:
+                responses = check_responses(responses, len(riasec_questions), options)
+            except ValueError as e:
+                # show the problem but keep rendering the other tabs
+                st.error(str(e))
+                responses = None
+            if responses is not None:
+                riasec_summary = score_responses(riasec_questions, responses)
+                st.success("RIASEC questionnaire completed!")
+                st.subheader("RIASEC Scores")
+                st.dataframe(riasec_summary)
+                st.session_state.riasec_summary = riasec_summary
+    elif st.session_state.riasec_idx < len(riasec_questions):
         idx = st.session_state.riasec_idx
         row = riasec_questions.iloc[idx]
         st.progress((idx+1)/len(riasec_questions))
@@ -160,15 +120,11 @@ with tabs[2]:
     st.write("Upload a TCI questions CSV (columns: ID, Question, Dimension) or use your own file.")
 
     tfile = st.file_uploader("Optional: Upload TCI questions CSV (25 items recommended)", type=["csv"], key="tci_questions_uploader")
-    tci_questions = safe_read(tfile) if tfile else None
+    tci_questions = upload_store.load(tfile, "questions") if tfile else None
     if tci_questions is None:
         st.info("No TCI questions file uploaded. Upload a CSV to take the questionnaire here.")
         st.stop()
 
-    tci_questions.columns = tci_questions.columns.str.strip()
-    if "ID" not in tci_questions.columns:
-        tci_questions.insert(0, "ID", range(1, len(tci_questions)+1))
-
     if "tci_idx" not in st.session_state:
         st.session_state.tci_idx = 0
     if "tci_responses" not in st.session_state:
@@ -186,7 +142,24 @@ with tabs[2]:
         st.session_state.tci_responses[st.session_state.tci_idx] = st.session_state.get(f"tci_q_{st.session_state.tci_idx}", 3)
         st.session_state.tci_idx += 1
 
-    if st.session_state.tci_idx < len(tci_questions):
+    if client_mode:
+        responses = questionnaire("TCI", tci_questions, t_options, "Select your answer:", key="tci_client")
+        if responses is None:
+            st.caption("Your answers stay in the browser until you submit.")
+        else:
+            try:
+                responses = check_responses(responses, len(tci_questions), t_options)
+            except ValueError as e:
+                # show the problem but keep rendering the other tabs
+                st.error(str(e))
+                responses = None
+            if responses is not None:
+                tci_summary = score_responses(tci_questions, responses, abbreviate=True)
+                st.success("TCI questionnaire completed!")
+                st.subheader("TCI Scores")
+                st.dataframe(tci_summary)
+                st.session_state.tci_summary = tci_summary
+    elif st.session_state.tci_idx < len(tci_questions):
         idx = st.session_state.tci_idx
         row = tci_questions.iloc[idx]
         st.progress((idx+1)/len(tci_questions))
@@ -235,23 +208,19 @@ with tabs[3]:
     if riasec_df_session is not None:
         riasec_df = riasec_df_session.copy()
     elif riasec_scores_upload:
-        riasec_df = safe_read(riasec_scores_upload)
-        riasec_df = normalize_riasec_df(riasec_df)
+        riasec_df = upload_store.load(riasec_scores_upload, "riasec_scores")
     elif riasec_local is not None:
         riasec_df = normalize_riasec_df(riasec_local)
 
     if tci_df_session is not None:
         tci_df = tci_df_session.copy()
     elif tci_scores_upload:
-        tci_df = safe_read(tci_scores_upload)
-        tci_df = normalize_tci_df(tci_df)
-        # make column name consistent
-        if "Dimension_Abbr" in tci_df.columns:
-            tci_df = tci_df.rename(columns={"Dimension_Abbr": "Dimension"})
+        # normalized with "Dimension" holding the abbreviation
+        tci_df = upload_store.load(tci_scores_upload, "tci_scores")
     elif tci_local is not None:
         tci_df = normalize_tci_df(tci_local)
         if "Dimension_Abbr" in tci_df.columns:
-            tci_df = tci_df.rename(columns={"Dimension_Abbr": "Dimension"})
+            tci_df = tci_df.drop(columns="Dimension").rename(columns={"Dimension_Abbr": "Dimension"})
 
     if riasec_df is None and tci_df is None:
         st.info("No score data available yet. Complete tests or upload score CSVs (or place files in /mnt/data/).")
@@ -264,7 +233,7 @@ with tabs[3]:
                 riasec_df = riasec_df.copy()
                 riasec_df["Score"] = pd.to_numeric(riasec_df["Score"], errors="coerce").fillna(0)
                 st.dataframe(riasec_df)
-                st.bar_chart(riasec_df.set_index("Dimension")["Score"])
+                st.vega_lite_chart(bar_chart_spec("RIASEC", zip(riasec_df["Dimension"].tolist(), riasec_df["Score"].tolist())), use_container_width=True)
             else:
                 st.info("No RIASEC data available.")
 
@@ -274,7 +243,7 @@ with tabs[3]:
                 tci_df = tci_df.copy()
                 tci_df["Score"] = pd.to_numeric(tci_df["Score"], errors="coerce").fillna(0)
                 st.dataframe(tci_df)
-                st.bar_chart(tci_df.set_index("Dimension")["Score"])
+                st.vega_lite_chart(bar_chart_spec("TCI", zip(tci_df["Dimension"].tolist(), tci_df["Score"].tolist())), use_container_width=True)
             else:
                 st.info("No TCI data available.")
 
@@ -304,35 +273,38 @@ with tabs[4]:
     if isinstance(tci_df_raw, pd.DataFrame):
         tci_df = normalize_tci_df(tci_df_raw)
         if "Dimension_Abbr" in tci_df.columns:
-            tci_df = tci_df.rename(columns={"Dimension_Abbr":"Dimension"})
+            # keep the abbreviation only, so "Dimension" stays a single column
+            tci_df = tci_df.drop(columns="Dimension").rename(columns={"Dimension_Abbr":"Dimension"})
     else:
         tci_df = None
 
     if riasec_df is None and tci_df is None:
         st.info("No data available to build the report. Complete tests or upload score CSVs.")
     else:
-        # Build textual summary
+        # Build textual summary (sort each frame once and reuse it below)
         summary_lines = []
         if riasec_df is not None:
-            r_top = riasec_df.sort_values("Score", ascending=False).iloc[0]
-            summary_lines.append(f"Top RIASEC dimension: {r_top['Dimension']} (Score: {r_top['Score']})")
+            r_sorted = riasec_df.sort_values("Score", ascending=False)
+            r_dims = r_sorted["Dimension"].tolist()
+            r_scores = r_sorted["Score"].tolist()
+            summary_lines.append(f"Top RIASEC dimension: {r_dims[0]} (Score: {r_scores[0]})")
             summary_lines.append("RIASEC breakdown:")
-            for _, r in riasec_df.sort_values("Score", ascending=False).iterrows():
-                summary_lines.append(f" - {r['Dimension']}: {r['Score']}")
+            summary_lines.extend(f" - {d}: {s}" for d, s in zip(r_dims, r_scores))
 
         if tci_df is not None:
-            t_top = tci_df.sort_values("Score", ascending=False).iloc[0]
-            summary_lines.append(f"Top TCI trait: {t_top['Dimension']} (Score: {t_top['Score']})")
+            t_sorted = tci_df.sort_values("Score", ascending=False)
+            t_dims = t_sorted["Dimension"].tolist()
+            t_scores = t_sorted["Score"].tolist()
+            summary_lines.append(f"Top TCI trait: {t_dims[0]} (Score: {t_scores[0]})")
             summary_lines.append("TCI breakdown:")
-            for _, t in tci_df.sort_values("Score", ascending=False).iterrows():
-                summary_lines.append(f" - {t['Dimension']}: {t['Score']}")
+            summary_lines.extend(f" - {d}: {s}" for d, s in zip(t_dims, t_scores))
 
         # combined suggestions (simple rule-based)
         suggestions = []
         if riasec_df is not None and tci_df is not None:
             # example rule: if R high and SD high -> engineering careers suggested
-            r_top_dim = riasec_df.sort_values("Score", ascending=False).iloc[0]["Dimension"]
-            t_top_dim = tci_df.sort_values("Score", ascending=False).iloc[0]["Dimension"]
+            r_top_dim = r_dims[0]
+            t_top_dim = t_dims[0]
             suggestions.append(f"Considering your top interest {r_top_dim} and temperament {t_top_dim}, consider exploring related fields and programs.")
         else:
             suggestions.append("Complete both tests for combined recommendations.")
@@ -370,18 +342,17 @@ with tabs[5]:
 
     if up_r:
         st.success("RIASEC scores file uploaded for session.")
-        df_r = safe_read(up_r)
-        st.dataframe(df_r)
-        st.session_state["riasec_summary"] = normalize_riasec_df(df_r)
+        df_rn = upload_store.load(up_r, "riasec_scores")
+        st.dataframe(df_rn)
+        st.session_state["riasec_summary"] = df_rn
 
     if up_t:
         st.success("TCI scores file uploaded for session.")
-        df_t = safe_read(up_t)
-        df_tn = normalize_tci_df(df_t)
-        if "Dimension_Abbr" in df_tn.columns:
-            df_tn = df_tn.rename(columns={"Dimension_Abbr":"Dimension"})
+        df_tn = upload_store.load(up_t, "tci_scores")
         st.dataframe(df_tn)
         st.session_state["tci_summary"] = df_tn
 
+    st.caption(upload_store.stats_text())
+
     st.markdown("---")
     st.info("If you want these files permanently available in the app without uploading each time, place them in the app's /mnt/data/ folder named exactly:\n- RIASEC test.csv\n- TCT test.csv\n(Your environment or deployment method determines whether you can write to /mnt/data/.)")
@@ -0,0 +1,249 @@
+# batch_reports.py
+"""Bulk per-respondent profile reports.
+
+Reads a long-form scores table (columns: Respondent, Source, Dimension, Score,
+where Source is "RIASEC" or "TCI") or a cohort directory/.zip via cohort.py,
+renders one HTML profile per respondent across a process pool and streams the
+files into a zip archive or directory.
+Charts come from chart_cache, so each worker renders a given score vector once.
+
+Usage:
+    python batch_reports.py cohort_scores.csv reports.zip
+    python batch_reports.py cohort_scores.csv reports_dir/ --workers 8
+    python batch_reports.py score_files/ reports.zip
+"""
+import os
+import re
+import hashlib
+import sys
+import zipfile
+import argparse
+from collections import deque
+from html import escape
+from itertools import groupby
+from string import Template
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from chart_cache import bar_chart_svg
+from cohort import load_cohort
+from score_utils import abbr_to_full, full_to_abbr, tci_descriptions, iter_chunks
+
+RIASEC_MEANINGS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "riasec_meanings.csv")
+
+# -----------------------
+# Report template (compiled once per process)
+# -----------------------
+REPORT_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Skillbot AI — Profile for $respondent</title>
+<style>
+body { font-family: sans-serif; margin: 2em; color: #222; }
+h1 { border-bottom: 2px solid #444; }
+td, th { padding: 2px 10px; text-align: left; }
+</style>
+</head>
+<body>
+<h1>Skillbot AI — Combined Profile</h1>
+<p><strong>Respondent:</strong> $respondent</p>
+$riasec_section
+$tci_section
+<h2>Recommendations</h2>
+<p>$recommendation</p>
+</body>
+</html>
+""")
+
+SECTION_TEMPLATE = Template("""<h2>$title</h2>
+<p><strong>$top_label:</strong> $top_name (Score: $top_score)</p>
+$chart
+<table>
+<tr><th>Dimension</th><th>Score</th><th>About</th></tr>
+$rows
+</table>
+""")
+
+ROW_TEMPLATE = Template("<tr><td>$name</td><td>$score</td><td>$about</td></tr>")
+
+_riasec_meanings = None
+
+def load_riasec_meanings(path=RIASEC_MEANINGS_PATH):
+    try:
+        df = pd.read_csv(path)
+        return dict(zip(df["Dimension"].astype(str).str.strip(), df["Meaning"].astype(str)))
+    except Exception:
+        return {}
+
+def _get_riasec_meanings():
+    # loaded lazily so each worker process reads the CSV once
+    global _riasec_meanings
+    if _riasec_meanings is None:
+        _riasec_meanings = load_riasec_meanings()
+    return _riasec_meanings
+
+# -----------------------
+# Input
+# -----------------------
+def load_cohort_scores(path):
+    if os.path.isdir(path) or zipfile.is_zipfile(path):
+        # a directory or archive of per-respondent score files
+        table, errors = load_cohort(path)
+        for error in errors:
+            print(f"skipped {error}", file=sys.stderr)
+        return table.reset_index()
+    df = pd.read_csv(path)
+    df.columns = df.columns.str.strip()
+    missing = {"Respondent", "Source", "Dimension", "Score"} - set(df.columns)
+    if missing:
+        raise ValueError(f"{path}: missing columns {sorted(missing)}")
+    return df
+
+def iter_respondent_records(df):
+    """Yield (respondent, riasec_items, tci_items) with items sorted by score, highest first.
+
+    Items are tuples of (dimension, score) pairs; TCI dimensions are abbreviated.
+    """
+    df = df[["Respondent", "Source", "Dimension", "Score"]].copy()
+    df["Source"] = df["Source"].astype(str).str.strip().str.upper()
+    df["Dimension"] = df["Dimension"].astype(str).str.strip()
+    is_tci = df["Source"] == "TCI"
+    df.loc[is_tci, "Dimension"] = df.loc[is_tci, "Dimension"].map(lambda v: full_to_abbr.get(v, v))
+    df["Score"] = pd.to_numeric(df["Score"], errors="coerce").fillna(0).astype(int)
+    # one sort for the whole cohort instead of one per respondent and section
+    df = df.sort_values(["Respondent", "Source", "Score"], ascending=[True, True, False], kind="stable")
+
+    rows = zip(df["Respondent"].tolist(), df["Source"].tolist(), df["Dimension"].tolist(), df["Score"].tolist())
+    for respondent, group in groupby(rows, key=lambda r: r[0]):
+        sections = {"RIASEC": [], "TCI": []}
+        for _, source, dim, score in group:
+            if source in sections:
+                sections[source].append((dim, score))
+        yield respondent, tuple(sections["RIASEC"]), tuple(sections["TCI"])
+
+# -----------------------
+# Rendering
+# -----------------------
+def _render_section(instrument, title, top_label, items, full_names, about):
+    if not items:
+        return ""
+    rows = "\n".join(
+        ROW_TEMPLATE.substitute(
+            name=escape(full_names.get(d, d)),
+            score=s,
+            about=escape(about.get(d, "")),
+        )
+        for d, s in items
+    )
+    top_dim, top_score = items[0]
+    return SECTION_TEMPLATE.substitute(
+        title=title,
+        top_label=top_label,
+        top_name=escape(full_names.get(top_dim, top_dim)),
+        top_score=top_score,
+        chart=bar_chart_svg(instrument, items),
+        rows=rows,
+    )
+
+def report_filename(respondent):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", str(respondent)).strip("_") + ".html"
+
+def _unique_filename(name, respondent, used):
+    # different ids can sanitize to the same name ("Anna Lee", "Anna/Lee");
+    # add a short hash of the raw id, then a counter if that still clashes
+    if name not in used:
+        return name
+    stem = name[:-len(".html")]
+    digest = hashlib.sha1(str(respondent).encode("utf-8")).hexdigest()[:8]
+    candidate = f"{stem}_{digest}.html"
+    n = 2
+    while candidate in used:
+        candidate = f"{stem}_{digest}_{n}.html"
+        n += 1
+    return candidate
+
+def render_report(record):
+    respondent, riasec_items, tci_items = record
+    if riasec_items and tci_items:
+        recommendation = (f"Considering your top interest {riasec_items[0][0]} and temperament "
+                          f"{tci_items[0][0]}, consider exploring related fields and programs.")
+    else:
+        recommendation = "Complete both tests for combined recommendations."
+    html = REPORT_TEMPLATE.substitute(
+        respondent=escape(str(respondent)),
+        riasec_section=_render_section("RIASEC", "RIASEC Interest Profile", "Top RIASEC dimension",
+                                       riasec_items, {}, _get_riasec_meanings()),
+        tci_section=_render_section("TCI", "TCI Temperament & Character Profile", "Top TCI trait",
+                                    tci_items, abbr_to_full, tci_descriptions),
+        recommendation=escape(recommendation),
+    )
+    return report_filename(respondent), html.encode("utf-8")
+
+def _render_chunk(records):
+    return [(r[0],) + render_report(r) for r in records]
+
+# -----------------------
+# Output
+# -----------------------
+def _iter_rendered(records, workers, chunk_size):
+    if workers == 1:
+        for chunk in iter_chunks(records, chunk_size):
+            yield from _render_chunk(chunk)
+        return
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # keep a bounded number of chunks in flight so output streams
+        # to disk instead of piling up in memory
+        pending = deque()
+        for chunk in iter_chunks(records, chunk_size):
+            pending.append(pool.submit(_render_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def generate_reports(records, out_path, workers=None, chunk_size=64, compress=True, compresslevel=1):
+    """Render every record and write it to out_path (a .zip file or a directory).
+
+    Returns the number of files written. workers=1 renders in-process.
+    Zip compression runs in this (parent) process; compress=False stores the
+    reports uncompressed so throughput scales with the worker pool.
+    """
+    used = set()
+    rendered = _iter_rendered(records, workers, chunk_size)
+    if str(out_path).lower().endswith(".zip"):
+        compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        with zipfile.ZipFile(out_path, "w", compression=compression,
+                             compresslevel=compresslevel if compress else None) as zf:
+            for respondent, name, data in rendered:
+                name = _unique_filename(name, respondent, used)
+                zf.writestr(name, data)
+                used.add(name)
+    else:
+        os.makedirs(out_path, exist_ok=True)
+        for respondent, name, data in rendered:
+            name = _unique_filename(name, respondent, used)
+            with open(os.path.join(out_path, name), "wb") as f:
+                f.write(data)
+            used.add(name)
+    return len(used)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate per-respondent HTML profile reports.")
+    parser.add_argument("scores_csv", help="long-form CSV with Respondent, Source, Dimension, Score, or a cohort directory/.zip")
+    parser.add_argument("out", help="output .zip file or directory")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=64)
+    parser.add_argument("--store", action="store_true", help="write the zip uncompressed (faster with many workers)")
+    args = parser.parse_args(argv)
+
+    df = load_cohort_scores(args.scores_csv)
+    n = generate_reports(iter_respondent_records(df), args.out, workers=args.workers,
+                         chunk_size=args.chunk_size, compress=not args.store)
+    print(f"Wrote {n} reports to {args.out}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+# benchmarks/bench_client_mode.py
+"""Server CPU per completed test: rerun-per-question flow vs client-side questionnaire mode.
+
+Both pages follow the RIASEC/TCI tabs of app.py and run headless under
+streamlit.testing.v1.AppTest, which executes the script in this process, so
+time.process_time() covers the server-side work. In client mode there is no
+browser, so the component is replaced by a stub that returns None on the
+first run and the full answer vector on the submit run.
+
+Run from the repository root:
+    python -m benchmarks.bench_client_mode [--repeats 5]
+"""
+import time
+import random
+import argparse
+from string import Template
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+import client_questionnaire
+
+INSTRUMENTS = {
+    "RIASEC": ("riasec_30_questions.csv", False),
+    "TCI": ("tci_25_questions (1).csv", True),
+}
+
+RERUN_PAGE = Template('''
+import streamlit as st
+import pandas as pd
+from score_utils import full_to_abbr
+
+questions = pd.read_csv($path)
+options = {1: "1", 2: "2", 3: "3", 4: "4", 5: "5"}
+if "idx" not in st.session_state:
+    st.session_state.idx = 0
+if "responses" not in st.session_state:
+    st.session_state.responses = {}
+
+def next_q():
+    st.session_state.responses[st.session_state.idx] = st.session_state.get(f"q_{st.session_state.idx}", 3)
+    st.session_state.idx += 1
+
+if st.session_state.idx < len(questions):
+    idx = st.session_state.idx
+    row = questions.iloc[idx]
+    st.progress((idx+1)/len(questions))
+    st.markdown(f"**Question {idx+1} of {len(questions)}**")
+    st.markdown(f"### {row.get('Question')}")
+    st.radio("Select your answer:", list(options.keys()), format_func=lambda x: options[x], key=f"q_{idx}")
+    st.button("Next", on_click=next_q)
+else:
+    qdf = questions.copy()
+    qdf["Score"] = pd.Series(st.session_state.responses).reindex(range(len(qdf))).fillna(3).astype(int).values
+    if $abbreviate:
+        qdf["Dimension"] = qdf["Dimension"].map(lambda x: full_to_abbr.get(str(x).strip(), x))
+    st.dataframe(qdf.groupby("Dimension")["Score"].sum().reset_index())
+''')
+
+CLIENT_PAGE = Template('''
+import streamlit as st
+import pandas as pd
+from client_questionnaire import questionnaire, check_responses
+from score_utils import score_responses
+
+questions = pd.read_csv($path)
+options = {1: "1", 2: "2", 3: "3", 4: "4", 5: "5"}
+responses = questionnaire($instrument, questions, options, "Select your answer:", key="client")
+if responses is not None:
+    responses = check_responses(responses, len(questions), options)
+    st.dataframe(score_responses(questions, responses, abbreviate=$abbreviate))
+''')
+
+class _StubBrowser:
+    # stands in for the frontend: nothing submitted until .value is set
+    def __init__(self):
+        self.value = None
+
+    def __call__(self, **kwargs):
+        return self.value
+
+def complete_rerun(path, abbreviate, rng):
+    at = AppTest.from_string(RERUN_PAGE.substitute(path=repr(path), abbreviate=abbreviate), default_timeout=30)
+    at.run()
+    runs = 1
+    while at.button:
+        at.radio[0].set_value(rng.randint(1, 5))
+        at.button[0].click().run()
+        runs += 1
+    assert at.dataframe, "rerun flow did not reach the results page"
+    return runs
+
+def complete_client(instrument, path, abbreviate, n_questions, rng):
+    browser = _StubBrowser()
+    original = client_questionnaire._component_func
+    client_questionnaire._component_func = browser
+    try:
+        at = AppTest.from_string(
+            CLIENT_PAGE.substitute(path=repr(path), instrument=repr(instrument), abbreviate=abbreviate),
+            default_timeout=30,
+        )
+        at.run()
+        browser.value = [rng.randint(1, 5) for _ in range(n_questions)]
+        at.run()
+    finally:
+        client_questionnaire._component_func = original
+    assert at.dataframe, "client flow did not reach the results page"
+    return 2
+
+def measure(fn, repeats):
+    start = time.process_time()
+    runs = 0
+    for _ in range(repeats):
+        runs = fn()
+    return (time.process_time() - start) / repeats, runs
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    for instrument, (path, abbreviate) in INSTRUMENTS.items():
+        n_questions = len(pd.read_csv(path))
+        rerun_cpu, rerun_runs = measure(lambda: complete_rerun(path, abbreviate, rng), args.repeats)
+        client_cpu, client_runs = measure(
+            lambda: complete_client(instrument, path, abbreviate, n_questions, rng), args.repeats)
+        print(f"{instrument:<7} questions={n_questions:<3} "
+              f"rerun: {rerun_cpu * 1000:8.1f} ms CPU/test ({rerun_runs} script runs)  "
+              f"client: {client_cpu * 1000:8.1f} ms CPU/test ({client_runs} script runs)  "
+              f"speedup x{rerun_cpu / client_cpu:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# benchmarks/bench_reports.py
+"""Throughput of batch_reports.generate_reports in reports/second.
+
+Run from the repository root:
+    python -m benchmarks.bench_reports [--respondents 5000] [--workers 4]
+"""
+import os
+import time
+import random
+import argparse
+import tempfile
+
+from batch_reports import generate_reports
+from score_utils import abbr_to_full
+
+RIASEC_DIMS = ["R", "I", "A", "S", "E", "C"]
+
+def synthetic_records(n, seed=0):
+    # 5 RIASEC items per dimension and 3-4 TCI items per dimension on a 1-5 scale
+    rng = random.Random(seed)
+    records = []
+    for i in range(n):
+        riasec = sorted(((d, rng.randint(5, 25)) for d in RIASEC_DIMS), key=lambda x: x[1], reverse=True)
+        tci = sorted(((d, rng.randint(3, 20)) for d in abbr_to_full), key=lambda x: x[1], reverse=True)
+        records.append((f"student_{i:06d}", tuple(riasec), tuple(tci)))
+    return records
+
+def run(records, workers, chunk_size, compress):
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "reports.zip")
+        start = time.perf_counter()
+        n = generate_reports(records, out, workers=workers, chunk_size=chunk_size, compress=compress)
+        elapsed = time.perf_counter() - start
+    return n, elapsed
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--respondents", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    args = parser.parse_args()
+
+    records = synthetic_records(args.respondents)
+    for compress in (True, False):
+        for workers in sorted({1, args.workers}):
+            n, elapsed = run(records, workers, args.chunk_size, compress)
+            print(f"{'deflate' if compress else 'stored':<8} workers={workers:<3} reports={n:<7} "
+                  f"time={elapsed:7.2f}s  {n / elapsed:9.1f} reports/s")
+
+if __name__ == "__main__":
+    main()
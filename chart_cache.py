@@ -0,0 +1,151 @@
+# chart_cache.py
+"""Process-wide LRU cache of rendered charts, keyed by (instrument, chart kind, score vector).
+
+Scores only take a handful of distinct values, so the same figure is built
+over and over for different users. Entries are stored serialized (Plotly
+JSON, Vega-Lite JSON or SVG text) so a cached chart can never be mutated by
+the caller that receives it.
+"""
+import json
+import threading
+from collections import OrderedDict
+from html import escape
+
+DEFAULT_MAXSIZE = 2048
+
+class ChartCache:
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, key, render):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        # render outside the lock; two sessions racing on a new key just
+        # both render it once
+        value = render()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
+
+chart_cache = ChartCache()
+
+def score_vector(items):
+    # (dimension, score) pairs -> hashable tuple of plain Python values
+    return tuple((str(d), s.item() if hasattr(s, "item") else s) for d, s in items)
+
+# -----------------------
+# Vega-Lite bar chart (same chart type st.bar_chart draws)
+# -----------------------
+def bar_chart_spec(instrument, items):
+    """Return a Vega-Lite spec for st.vega_lite_chart, bars kept in the given order."""
+    vector = score_vector(items)
+
+    def render():
+        return json.dumps({
+            "data": {"values": [{"Dimension": d, "Score": s} for d, s in vector]},
+            "mark": "bar",
+            "encoding": {
+                "x": {"field": "Dimension", "type": "nominal", "sort": None},
+                "y": {"field": "Score", "type": "quantitative"},
+            },
+        })
+
+    return json.loads(chart_cache.get_or_render((instrument, "vega_bar", vector), render))
+
+# -----------------------
+# Plotly figures (app (1).py results page)
+# -----------------------
+def plotly_bar_spec(instrument, items, range_y=(0, 30)):
+    """Return the RIASEC overview bar chart as a Plotly figure dict for st.plotly_chart."""
+    vector = score_vector(items)
+
+    def render():
+        import pandas as pd
+        import plotly.express as px
+
+        scores_df = pd.DataFrame(list(vector), columns=["Dimension", "Score"])
+        fig = px.bar(
+            scores_df,
+            x="Dimension",
+            y="Score",
+            text="Score",
+            range_y=list(range_y),
+            color="Score",
+            color_continuous_scale="Viridis"
+        )
+        fig.update_layout(yaxis_title="Score", xaxis_title="Dimension", showlegend=False)
+        return fig.to_json()
+
+    return json.loads(chart_cache.get_or_render((instrument, "plotly_bar", vector, tuple(range_y)), render))
+
+def plotly_radar_spec(instrument, items):
+    """Return a filled radar chart as a Plotly figure dict for st.plotly_chart."""
+    vector = score_vector(items)
+
+    def render():
+        import pandas as pd
+        import plotly.express as px
+
+        scores_df = pd.DataFrame(list(vector), columns=["Dimension", "Score"])
+        fig = px.line_polar(
+            scores_df,
+            r="Score",
+            theta="Dimension",
+            line_close=True,
+            markers=True
+        )
+        fig.update_traces(fill='toself')
+        return fig.to_json()
+
+    return json.loads(chart_cache.get_or_render((instrument, "plotly_radar", vector), render))
+
+# -----------------------
+# Static SVG (batch reports)
+# -----------------------
+def bar_chart_svg(instrument, items):
+    """Return a standalone SVG bar chart, suitable for inlining into HTML reports."""
+    vector = score_vector(items)
+
+    def render():
+        bar_w, gap, height = 40, 12, 160
+        top = max(max((s for _, s in vector), default=0), 1)
+        width = len(vector) * (bar_w + gap) + gap
+        parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height + 40}">']
+        for i, (label, score) in enumerate(vector):
+            x = gap + i * (bar_w + gap)
+            h = round(height * score / top)
+            parts.append(f'<rect x="{x}" y="{height - h + 10}" width="{bar_w}" height="{h}" fill="#3b6ea8"/>')
+            parts.append(f'<text x="{x + bar_w / 2}" y="{height - h + 5}" font-size="11" text-anchor="middle">{score}</text>')
+            parts.append(f'<text x="{x + bar_w / 2}" y="{height + 28}" font-size="11" text-anchor="middle">{escape(label)}</text>')
+        parts.append("</svg>")
+        return "".join(parts)
+
+    return chart_cache.get_or_render((instrument, "svg_bar", vector), render)
@@ -0,0 +1,41 @@
+# client_questionnaire.py
+"""Client-side questionnaire delivery.
+
+The whole question bank and answer scale are shipped to the browser as one
+static component. Answers are recorded locally and the complete response
+vector is posted back once, so a test costs two script runs on the server
+(render + submit) instead of one rerun per question.
+"""
+import os
+
+import streamlit.components.v1 as components
+
+_FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend", "questionnaire")
+_component_func = components.declare_component("skillbot_questionnaire", path=_FRONTEND_DIR)
+
+def questionnaire(instrument, questions, options, prompt, key=None):
+    """Render the full questionnaire; return the list of answers after submit, otherwise None.
+
+    questions is a DataFrame with ID and Question columns, options maps answer value -> label.
+    """
+    # ids only feed the browser's storage hash, so any value (Q1, NaN) is fine as text
+    payload = [{"id": str(i), "question": str(q)} for i, q in zip(questions["ID"], questions["Question"])]
+    return _component_func(
+        instrument=instrument,
+        questions=payload,
+        options=[[int(k), str(v)] for k, v in options.items()],
+        prompt=prompt,
+        key=key,
+        default=None,
+    )
+
+def check_responses(responses, n_questions, options):
+    # the vector comes from the browser, so validate before scoring
+    if not isinstance(responses, list) or len(responses) != n_questions:
+        raise ValueError(f"Expected {n_questions} answers, got {len(responses) if isinstance(responses, list) else type(responses).__name__}.")
+    allowed = {int(k) for k in options}
+    # JSON true/false would pass `in allowed` because True == 1
+    bad = [i + 1 for i, r in enumerate(responses) if isinstance(r, bool) or r not in allowed]
+    if bad:
+        raise ValueError(f"Invalid answers for question(s): {bad}")
+    return [int(r) for r in responses]
@@ -0,0 +1,278 @@
+# cohort.py
+"""Bulk ingestion of per-respondent score files into one cohort table.
+
+Point load_cohort() at a directory (searched recursively for *.csv) or a
+.zip archive of score files. Files are parsed and normalized in parallel,
+the differing column layouts are reconciled with score_utils.reconcile_scores,
+and everything is merged into one table indexed by
+(Respondent, Source, Dimension) with a Score column. Its reset_index() form is
+the long-form input batch_reports.py expects.
+
+Each file's instrument comes from its name ("riasec", "tci"/"tct") or, failing
+that, from its dimensions. The respondent id is the relative path without the
+instrument token (classA/student_001_riasec.csv -> classA/student_001), or
+the folder path when nothing else is left (student_001/RIASEC test.csv ->
+student_001). Top-level "RIASEC test.csv"/"TCT test.csv" share one id, the
+source's base name. Files that cannot be parsed, or that repeat a respondent's
+instrument, are skipped and reported in the returned errors.
+
+Results are cached on disk by a fingerprint of the source (paths, sizes and
+modification times) or, for uploaded archives, by their content digest, so
+reopening an unchanged cohort skips parsing. The cache directory
+($SKILLBOT_COHORT_CACHE, default ~/.cache/skillbot/cohort_cache) must be
+private to the app's user. An outdated table for the same source is deleted
+when it is rebuilt, the directory is capped at $SKILLBOT_COHORT_CACHE_MAX_MB
+(default 256, least recently used first), and it can be deleted at any time.
+"""
+import os
+import re
+import pickle
+import hashlib
+import tempfile
+import zipfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO, StringIO
+
+import pandas as pd
+
+from score_utils import reconcile_scores, abbr_to_full, private_dir, iter_chunks, evict_lru, CACHE_ROOT
+
+DEFAULT_CACHE_DIR = os.environ.get("SKILLBOT_COHORT_CACHE", os.path.join(CACHE_ROOT, "cohort_cache"))
+DEFAULT_CACHE_MAX_BYTES = int(os.environ.get("SKILLBOT_COHORT_CACHE_MAX_MB", "256")) * 1024 * 1024
+# bump whenever parsing changes, so cached tables from older code are rebuilt
+COHORT_VERSION = 3
+RIASEC_DIMS = {"R", "I", "A", "S", "E", "C"}
+INSTRUMENT_TOKENS = re.compile(r"(?<![a-z])(riasec|tci|tct)(?![a-z])", re.IGNORECASE)
+
+_memory = OrderedDict()   # fingerprint -> (table, errors), for reruns in the same process
+_memory_lock = threading.Lock()
+
+# -----------------------
+# Discovery
+# -----------------------
+def discover_files(source):
+    """Return (archive, name) pairs for every CSV under source; archive is None for a directory."""
+    if os.path.isdir(source):
+        found = []
+        for dirpath, _, filenames in os.walk(source):
+            for fn in filenames:
+                if fn.lower().endswith(".csv"):
+                    found.append((None, os.path.relpath(os.path.join(dirpath, fn), source)))
+        return sorted(found)
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as zf:
+            return sorted((source, info.filename) for info in zf.infolist()
+                          if not info.is_dir() and info.filename.lower().endswith(".csv")
+                          and not info.filename.startswith("__MACOSX/"))
+    raise ValueError(f"{source} is neither a directory nor a .zip archive")
+
+def source_label(source):
+    # shared respondent id for top-level files such as "RIASEC test.csv"
+    return os.path.splitext(os.path.basename(os.path.normpath(source)))[0]
+
+def fingerprint(source, label=""):
+    h = hashlib.sha256(f"v{COHORT_VERSION}\0{label}\0{os.path.abspath(source)}".encode("utf-8"))
+    if os.path.isdir(source):
+        for _, name in discover_files(source):
+            st = os.stat(os.path.join(source, name))
+            h.update(f"{name}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8"))
+    else:
+        st = os.stat(source)
+        h.update(f"{st.st_size}\0{st.st_mtime_ns}".encode("utf-8"))
+    return h.hexdigest()
+
+# -----------------------
+# Parsing (runs in worker processes)
+# -----------------------
+def _instrument_from_name(name):
+    match = INSTRUMENT_TOKENS.search(os.path.basename(name))
+    if match is None:
+        return None
+    return "RIASEC" if match.group(0).lower() == "riasec" else "TCI"
+
+def respondent_id(name, default=None):
+    # the relative folder is part of the id, so classA/student_001 and
+    # classB/student_001 stay two respondents; top-level files with nothing
+    # but an instrument name ("RIASEC test.csv", "TCT test.csv") share `default`
+    parts = name.replace("\\", "/").split("/")
+    stem = os.path.splitext(parts[-1])[0]
+    stem = INSTRUMENT_TOKENS.sub("", stem)
+    stem = re.sub(r"(?<![a-z])(test|scores?)(?![a-z])", "", stem, flags=re.IGNORECASE)
+    stem = re.sub(r"[\s_.\-]+", "_", stem).strip("_")
+    folders = [p for p in parts[:-1] if p]
+    if stem:
+        return "/".join(folders + [stem])
+    if folders:
+        return "/".join(folders)
+    return default or os.path.splitext(parts[-1])[0]
+
+def _read_csv(data):
+    try:
+        return pd.read_csv(BytesIO(data))
+    except Exception:
+        return pd.read_csv(StringIO(data.decode("utf-8")))
+
+def parse_score_file(name, data, default_id=None):
+    """Return (rows, error); rows are (Respondent, Source, Dimension, Score) tuples.
+
+    Never raises: one malformed file must not abort a cohort of thousands.
+    """
+    try:
+        raw = _read_csv(data)
+        source = _instrument_from_name(name)
+        if source is None:
+            # no hint in the name: decide from the dimensions themselves
+            probe = reconcile_scores(raw, "RIASEC")
+            if probe is None:
+                return [], f"{name}: expected at least two columns"
+            source = "RIASEC" if set(probe["Dimension"]) <= RIASEC_DIMS else "TCI"
+        df = reconcile_scores(raw, source)
+        if df is None or df.empty:
+            return [], f"{name}: expected at least two columns"
+        if source == "TCI" and not set(df["Dimension"]) & set(abbr_to_full):
+            return [], f"{name}: no TCI dimensions found"
+        respondent = respondent_id(name, default_id)
+        return [(respondent, source, d, s) for d, s in zip(df["Dimension"].tolist(), df["Score"].tolist())], None
+    except Exception as e:
+        return [], f"{name}: {type(e).__name__}: {e}"
+
+def _parse_chunk(source, entries, default_id=None):
+    # returns (name, rows, error) per file, in order
+    results = []
+    zf = zipfile.ZipFile(source) if entries and entries[0][0] is not None else None
+    try:
+        for _, name in entries:
+            try:
+                if zf is not None:
+                    data = zf.read(name)
+                else:
+                    with open(os.path.join(source, name), "rb") as f:
+                        data = f.read()
+            except Exception as e:
+                results.append((name, [], f"{name}: {type(e).__name__}: {e}"))
+                continue
+            file_rows, error = parse_score_file(name, data, default_id)
+            results.append((name, file_rows, error))
+    finally:
+        if zf is not None:
+            zf.close()
+    return results
+
+def _parse_all(source, chunks, workers, default_id):
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield from _parse_chunk(source, chunk, default_id)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        n = len(chunks)
+        for results in pool.map(_parse_chunk, [source] * n, chunks, [default_id] * n):
+            yield from results
+
+# -----------------------
+# Merge + cache
+# -----------------------
+def build_cohort(source, workers=None, chunk_size=200, label=None):
+    """Parse every score file under source; return (table, errors) without caching.
+
+    label is the respondent id for top-level files that carry only an
+    instrument name (default: the source's base name).
+    """
+    label = label or source_label(source)
+    entries = discover_files(source)
+    rows, errors = [], []
+    owner = {}   # (Respondent, Source) -> file it came from
+    for name, file_rows, error in _parse_all(source, list(iter_chunks(entries, chunk_size)), workers, label):
+        if error:
+            errors.append(error)
+        if not file_rows:
+            continue
+        key = file_rows[0][:2]
+        if key in owner:
+            # two files claim the same respondent and instrument; keep the
+            # first (in sorted order) and report the clash
+            errors.append(f"{name}: duplicate {key[1]} scores for respondent "
+                          f"{key[0]!r} (already read from {owner[key]}); skipped")
+            continue
+        owner[key] = name
+        rows.extend(file_rows)
+
+    df = pd.DataFrame(rows, columns=["Respondent", "Source", "Dimension", "Score"])
+    df["Respondent"] = df["Respondent"].astype(str)
+    # duplicate dimensions inside one file keep the last row
+    table = df.groupby(["Respondent", "Source", "Dimension"], sort=True)["Score"].last().to_frame()
+    return table, errors
+
+def load_cohort(source, workers=None, cache_dir=DEFAULT_CACHE_DIR, cache_key=None, label=None,
+                max_cache_bytes=DEFAULT_CACHE_MAX_BYTES):
+    """Like build_cohort, but served from memory or the on-disk cache when source is unchanged.
+
+    For content-addressed sources (an upload-store blob) pass its digest as
+    cache_key: the cache then follows the content, not the file's mtime.
+    """
+    label = label or source_label(source)
+    if cache_key is not None:
+        owner = f"digest:{cache_key}"
+        key = hashlib.sha256(f"v{COHORT_VERSION}\0{label}\0{owner}".encode("utf-8")).hexdigest()
+    else:
+        owner = os.path.abspath(source)
+        key = fingerprint(source, label)
+    with _memory_lock:
+        if key in _memory:
+            _memory.move_to_end(key)
+            return _memory[key]
+
+    # the cache holds pickles: only ever read it from a directory private to us
+    private_dir(cache_dir)
+    # <source>-<fingerprint>.pkl, so an outdated table for the same source can be found
+    prefix = hashlib.sha256(owner.encode("utf-8")).hexdigest()[:16]
+    path = os.path.join(cache_dir, f"{prefix}-{key}.pkl")
+    result = None
+    if os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                result = pickle.load(f)
+            os.utime(path)
+        except Exception:
+            result = None
+    if result is None:
+        result = build_cohort(source, workers=workers, label=label)
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        for fn in os.listdir(cache_dir):
+            if fn.startswith(prefix + "-") and fn != os.path.basename(path):
+                try:
+                    os.remove(os.path.join(cache_dir, fn))
+                except OSError:
+                    pass
+        evict_lru(cache_dir, max_cache_bytes, keep=path)
+
+    with _memory_lock:
+        _memory[key] = result
+        while len(_memory) > 8:
+            _memory.popitem(last=False)
+    return result
+
+# -----------------------
+# Views
+# -----------------------
+def respondents(table):
+    return table.index.get_level_values("Respondent").unique().tolist()
+
+def respondent_scores(table, respondent, source):
+    """Dimension, Score frame for one respondent and instrument (None if missing)."""
+    try:
+        part = table.loc[(respondent, source)]
+    except KeyError:
+        return None
+    return part.reset_index()[["Dimension", "Score"]]
+
+def cohort_means(table, source):
+    try:
+        part = table.xs(source, level="Source")
+    except KeyError:
+        return None
+    return part.groupby(level="Dimension")["Score"].mean().round(2).reset_index()
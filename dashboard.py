@@ -1,8 +1,17 @@
+import os
+
 import streamlit as st
-import pandas as pd
+
+from chart_cache import bar_chart_spec
+from cohort import load_cohort, respondents, respondent_scores, cohort_means
+from score_utils import abbr_to_full
+from upload_store import upload_store
 
 st.set_page_config(page_title="Combined RIASEC + TCI Dashboard", layout="wide")
 
+# Cohort mode only reads server paths under this directory; unset = .zip upload only
+COHORT_ROOT = os.environ.get("SKILLBOT_COHORT_ROOT")
+
 st.title("🧠 Combined RIASEC + TCI Personality Dashboard")
 
 # -----------------------------
@@ -10,20 +19,93 @@ st.title("🧠 Combined RIASEC + TCI Personality Dashboard")
 # -----------------------------
 st.sidebar.header("📂 Upload Your Test Files")
 
-riasec_file = st.sidebar.file_uploader("Upload RIASEC CSV", type=["csv"])
-tci_file = st.sidebar.file_uploader("Upload TCI CSV", type=["csv"])
+SINGLE_MODE = "One respondent (two files)"
+COHORT_MODE = "Cohort (directory or .zip of score files)"
+mode = st.sidebar.radio("Mode", [SINGLE_MODE, COHORT_MODE])
+
+riasec_df = None
+tci_df = None
+
+if mode == SINGLE_MODE:
+    riasec_file = st.sidebar.file_uploader("Upload RIASEC CSV", type=["csv"])
+    tci_file = st.sidebar.file_uploader("Upload TCI CSV", type=["csv"])
+
+    if riasec_file and tci_file:
+        # Read files (repeat uploads of the same bytes are served from the shared store);
+        # any of the known column layouts is reconciled to Dimension, Score
+        riasec_df = upload_store.load(riasec_file, "riasec_scores")
+        tci_df = upload_store.load(tci_file, "tci_scores")
 
+        st.success("Files uploaded successfully!")
+        st.sidebar.caption(upload_store.stats_text())
 
 # -----------------------------
-# When both files are uploaded
+# Cohort Section
 # -----------------------------
-if riasec_file and tci_file:
+else:
+    cohort_path = None
+    cohort_key = None
+    cohort_label = None
+    if COHORT_ROOT:
+        # server paths are only allowed inside the configured cohort root
+        typed = st.sidebar.text_input(f"Directory or .zip path under {COHORT_ROOT}")
+        if typed:
+            root = os.path.realpath(COHORT_ROOT)
+            resolved = os.path.realpath(os.path.join(root, typed))
+            if os.path.commonpath([root, resolved]) != root:
+                st.error(f"Path must be inside {COHORT_ROOT}.")
+                st.stop()
+            cohort_path = resolved
+    cohort_zip = st.sidebar.file_uploader("Upload a .zip of score files", type=["zip"])
+    if cohort_zip:
+        # hash the archive once per upload, not on every rerun
+        file_id = (getattr(cohort_zip, "file_id", None) or getattr(cohort_zip, "id", None)
+                   or (cohort_zip.name, cohort_zip.size))
+        digests = st.session_state.setdefault("cohort_zip_digests", {})
+        # store it again if the blob was evicted since it was hashed
+        if file_id not in digests or not os.path.exists(upload_store.blob_path(digests[file_id])):
+            digests[file_id] = upload_store.put_bytes(cohort_zip.getvalue(), count=False)
+        cohort_path = upload_store.blob_path(digests[file_id])
+        # cache by content digest (the blob's mtime changes on repeat uploads),
+        # and name top-level "RIASEC test.csv"/"TCT test.csv" after the archive
+        cohort_key = digests[file_id]
+        cohort_label = os.path.splitext(cohort_zip.name)[0]
+
+    if cohort_path:
+        try:
+            with st.spinner("Loading cohort..."):
+                cohort_table, cohort_errors = load_cohort(cohort_path, cache_key=cohort_key, label=cohort_label)
+        except (OSError, ValueError) as e:
+            st.error(f"Could not load cohort: {e}")
+            st.stop()
+
+        people = respondents(cohort_table)
+        st.header("👥 Cohort Overview")
+        st.markdown(f"**{len(people)} respondents** loaded from `{cohort_path}`.")
+        if cohort_errors:
+            with st.expander(f"{len(cohort_errors)} file(s) skipped"):
+                st.text("\n".join(cohort_errors))
+
+        col1, col2 = st.columns(2)
+        for col, source in ((col1, "RIASEC"), (col2, "TCI")):
+            means = cohort_means(cohort_table, source)
+            with col:
+                st.subheader(f"{source} cohort mean")
+                if means is not None:
+                    st.vega_lite_chart(bar_chart_spec(f"{source} cohort mean", zip(means["Dimension"].tolist(), means["Score"].tolist())), use_container_width=True)
+                else:
+                    st.info(f"No {source} files in this cohort.")
+
+        if people:
+            selected = st.selectbox("Respondent", people)
+            riasec_df = respondent_scores(cohort_table, selected, "RIASEC")
+            tci_df = respondent_scores(cohort_table, selected, "TCI")
 
-    # Read files
-    riasec_df = pd.read_csv(riasec_file)
-    tci_df = pd.read_csv(tci_file)
 
-    st.success("Files uploaded successfully!")
+# -----------------------------
+# When both score tables are available
+# -----------------------------
+if riasec_df is not None and tci_df is not None:
 
     # -----------------------------
     # RIASEC Section
@@ -33,8 +115,8 @@ if riasec_file and tci_file:
 
     # Bar Chart – RIASEC
     st.subheader("📊 RIASEC Score Chart")
-    riasec_chart = riasec_df.set_index("Dimension")["Score"]
-    st.bar_chart(riasec_chart)
+    riasec_chart = bar_chart_spec("RIASEC", zip(riasec_df["Dimension"].tolist(), riasec_df["Score"].tolist()))
+    st.vega_lite_chart(riasec_chart, use_container_width=True)
 
     # -----------------------------
     # TCI Section
@@ -42,15 +124,10 @@ if riasec_file and tci_file:
     st.header("🧬 TCI Temperament & Character Profile")
     st.dataframe(tci_df)
 
-    # Fix TCI Columns based on kernel state
-    # The columns are 'index -- streamlit-generated' for Dimension and '0' for Score
-    tci_df = tci_df.rename(columns={'index -- streamlit-generated': 'Dimension', 0: 'Score'})
-    tci_df = tci_df[['Dimension', 'Score']]
-
     # Bar Chart – TCI
     st.subheader("📈 TCI Score Chart")
-    tci_chart = tci_df.set_index("Dimension")["Score"]
-    st.bar_chart(tci_chart)
+    tci_chart = bar_chart_spec("TCI", zip(tci_df["Dimension"].tolist(), tci_df["Score"].tolist()))
+    st.vega_lite_chart(tci_chart, use_container_width=True)
 
     # -----------------------------
     # RIASEC Interpretation
@@ -75,7 +152,7 @@ if riasec_file and tci_file:
     # -----------------------------
     def interpret_tci(tci_df):
         highest = tci_df.sort_values("Score", ascending=False).iloc[0]
-        dim = highest["Dimension"]
+        dim = abbr_to_full.get(highest["Dimension"], highest["Dimension"])
         return f"**Dominant TCI Trait: {dim}**"
 
     st.markdown(interpret_riasec(riasec_df))
@@ -86,6 +163,8 @@ if riasec_file and tci_file:
     # -----------------------------
     st.header("🧩 Combined Personality Summary")
 
+    # scores carry TCI abbreviations; show the full trait name
+    top_tci = tci_df.sort_values("Score", ascending=False).iloc[0]["Dimension"]
     combined_summary = f"""
 ### ⭐ Final Combined Personality Summary
 
@@ -94,7 +173,7 @@ Your career interests are primarily guided by **{riasec_df.sort_values("Score",
 showing the type of work you naturally enjoy.
 
 **TCI insights:**
-Your temperament is shaped strongly by **{tci_df.sort_values("Score", ascending=False).iloc[0]["Dimension"]}**,
+Your temperament is shaped strongly by **{abbr_to_full.get(top_tci, top_tci)}**,
 which reflects emotional and decision-making tendencies.
 
 Together, these tests show how your **career interests (RIASEC)**
@@ -104,4 +183,4 @@ and **temperament/character (TCI)** combine to create your unique personality pr
     st.markdown(combined_summary)
 
 else:
-    st.info("Please upload both CSV files to generate your dashboard.")
+    st.info("Please upload both CSV files (or pick a respondent with both tests) to generate your dashboard.")
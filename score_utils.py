@@ -0,0 +1,162 @@
+# score_utils.py
+import pandas as pd
+import os
+import stat
+from itertools import islice
+
+# -----------------------
+# Shared score helpers (used by app.py and the batch tools)
+# -----------------------
+def try_read_csv(path):
+    try:
+        if os.path.exists(path):
+            return pd.read_csv(path)
+    except Exception:
+        return None
+    return None
+
+def private_dir(path):
+    # cache dirs hold pickles, so refuse one another user could have planted
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode):
+        raise PermissionError(f"{path} is not a directory")
+    if hasattr(os, "getuid"):
+        if st.st_uid != os.getuid():
+            raise PermissionError(f"{path} is owned by another user")
+        if st.st_mode & 0o077:
+            os.chmod(path, 0o700)
+    return path
+
+def iter_chunks(items, size):
+    # lists of up to `size` items, for handing work to a process pool
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+def evict_lru(root, max_bytes, keep, is_stale=None):
+    # delete least recently used files under root (callers bump mtime on
+    # hits) until it fits in max_bytes; files in is_stale(dirpath) dirs go
+    # first. `keep` (the file just written) is never removed, even if it
+    # alone is over the cap.
+    files = []
+    total = os.path.getsize(keep) if os.path.exists(keep) else 0
+    for dirpath, _, filenames in os.walk(root):
+        stale = bool(is_stale and is_stale(dirpath))
+        for fn in filenames:
+            path = os.path.join(dirpath, fn)
+            if path == keep:
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            total += st.st_size
+            files.append((not stale, st.st_mtime, st.st_size, path))
+    if total <= max_bytes:
+        return
+    for _, _, size, path in sorted(files):
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        if total <= max_bytes:
+            break
+
+CACHE_ROOT = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "skillbot")
+
+# normalize TCI abbreviation mapping (if needed)
+abbr_to_full = {
+    "NS": "Novelty Seeking",
+    "HA": "Harm Avoidance",
+    "RD": "Reward Dependence",
+    "P":  "Persistence",
+    "SD": "Self-Directedness",
+    "C":  "Cooperativeness",
+    "ST": "Self-Transcendence"
+}
+full_to_abbr = {v: k for k, v in abbr_to_full.items()}
+
+tci_descriptions = {
+    "NS": "High novelty seekers are curious, impulsive, and always ready for new adventures.",
+    "HA": "High harm avoidance individuals are cautious, careful, and easily stressed.",
+    "RD": "Reward dependent people are warm, loving, and sensitive to social approval.",
+    "P":  "Persistent individuals are determined, hard-working, and goal-oriented.",
+    "SD": "Self-directed individuals are responsible, purposeful, and motivated.",
+    "C":  "Cooperative individuals are empathetic, kind, and supportive.",
+    "ST": "Self-transcendent people are spiritual, imaginative, and intuitive."
+}
+
+def _dimension_score_columns(df):
+    # find the Dimension/Score columns whatever their case or padding
+    by_name = {str(c).strip().lower(): c for c in df.columns}
+    if "dimension" in by_name and "score" in by_name:
+        return [by_name["dimension"], by_name["score"]]
+    return None
+
+def normalize_riasec_df(df):
+    # Accept dataframes that have either columns: Dimension, Score
+    # or two columns with letters and scores. Return DataFrame with Dimension, Score
+    if df is None:
+        return None
+    # try common names
+    named = _dimension_score_columns(df)
+    if named:
+        out = df[named].copy()
+        out.columns = ["Dimension","Score"]
+    elif len(df.columns) >= 2:
+        # pick first two columns
+        out = df.iloc[:, :2].copy()
+        out.columns = ["Dimension","Score"]
+    else:
+        return None
+    # normalize Dimension values (strip)
+    out["Dimension"] = out["Dimension"].astype(str).str.strip()
+    out["Score"] = pd.to_numeric(out["Score"], errors="coerce").fillna(0).astype(int)
+    return out
+
+def normalize_tci_df(df):
+    if df is None:
+        return None
+    named = _dimension_score_columns(df)
+    if named:
+        out = df[named].copy()
+        out.columns = ["Dimension","Score"]
+    elif len(df.columns) >= 2:
+        out = df.iloc[:, :2].copy()
+        out.columns = ["Dimension","Score"]
+    else:
+        return None
+    out["Dimension"] = out["Dimension"].astype(str).str.strip()
+    out["Score"] = pd.to_numeric(out["Score"], errors="coerce").fillna(0).astype(int)
+    # try to convert full names to abbreviations if needed
+    out["Dimension_Abbr"] = out["Dimension"].apply(lambda v: full_to_abbr.get(v, v) if isinstance(v, str) else v)
+    return out
+
+def reconcile_scores(df, source):
+    # bring any known score layout (Dimension/Score, first two columns,
+    # a saved index column, streamlit-generated names) to Dimension, Score;
+    # TCI dimensions are abbreviated
+    if df is None:
+        return None
+    df = df.loc[:, [c for c in df.columns if not str(c).startswith("Unnamed:")]]
+    if source == "TCI":
+        out = normalize_tci_df(df)
+        if out is not None:
+            out = out.drop(columns="Dimension").rename(columns={"Dimension_Abbr": "Dimension"})
+        return out
+    return normalize_riasec_df(df)
+
+def score_responses(questions, responses, abbreviate=False):
+    # responses are in question order; returns DataFrame with Dimension, Score
+    qdf = questions.copy()
+    qdf["Score"] = list(responses)
+    dims = qdf["Dimension"].astype(str).str.strip()
+    if abbreviate:
+        dims = dims.map(lambda x: full_to_abbr.get(x, x))
+    qdf["Dimension"] = dims
+    return qdf.groupby("Dimension")["Score"].sum().reset_index()
@@ -0,0 +1,196 @@
+# upload_store.py
+"""Content-addressed store for uploaded CSVs, shared by every session in the process.
+
+Incoming bytes are hashed (SHA-256). Each distinct upload is kept once on disk
+together with one parsed, normalized artifact per kind, so a repeat upload of
+the same question bank or score file skips parsing and normalization.
+
+The store lives in $SKILLBOT_UPLOAD_STORE (default: ~/.cache/skillbot/upload_store),
+a directory private to the app's user since artifacts are pickles:
+    blobs/<hash>                            raw bytes
+    artifacts/v<ARTIFACT_VERSION>/<kind>/<hash>.pkl  parsed DataFrame
+
+Disk use is capped at $SKILLBOT_UPLOAD_STORE_MAX_MB (default 512); when a
+write goes over it, the least recently used files are deleted. Artifacts of
+older versions are never read again and go first. Deleting the directory
+is always safe.
+"""
+import os
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from io import BytesIO, StringIO
+
+import pandas as pd
+
+from score_utils import reconcile_scores, private_dir, evict_lru, CACHE_ROOT
+
+DEFAULT_ROOT = os.environ.get("SKILLBOT_UPLOAD_STORE", os.path.join(CACHE_ROOT, "upload_store"))
+DEFAULT_MAX_BYTES = int(os.environ.get("SKILLBOT_UPLOAD_STORE_MAX_MB", "512")) * 1024 * 1024
+DEFAULT_MEMORY_ITEMS = 256
+# bump whenever a parser's output changes, so stale artifacts are not served
+ARTIFACT_VERSION = 3
+
+# -----------------------
+# Parsers (one artifact per kind and hash)
+# -----------------------
+def read_csv_bytes(data):
+    try:
+        return pd.read_csv(BytesIO(data))
+    except Exception:
+        # try read as text then parse
+        return pd.read_csv(StringIO(data.decode("utf-8")))
+
+def parse_questions(data):
+    df = read_csv_bytes(data)
+    df.columns = df.columns.str.strip()
+    if "ID" not in df.columns:
+        df.insert(0, "ID", range(1, len(df)+1))
+    return df
+
+def parse_riasec_scores(data):
+    return reconcile_scores(read_csv_bytes(data), "RIASEC")
+
+def parse_tci_scores(data):
+    return reconcile_scores(read_csv_bytes(data), "TCI")
+
+PARSERS = {
+    "csv": read_csv_bytes,
+    "questions": parse_questions,
+    "riasec_scores": parse_riasec_scores,
+    "tci_scores": parse_tci_scores,
+}
+
+def _atomic_write(path, write):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+class UploadStore:
+    def __init__(self, root=DEFAULT_ROOT, memory_items=DEFAULT_MEMORY_ITEMS, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.memory_items = memory_items
+        self.max_bytes = max_bytes
+        self._root_checked = False
+        self._artifacts = OrderedDict()   # (kind, hash) -> DataFrame
+        self._seen_files = OrderedDict()  # Streamlit file ids already counted
+        self._lock = threading.Lock()
+        self.uploads = 0
+        self.duplicate_uploads = 0
+        self.bytes_received = 0
+        self.bytes_saved = 0
+        self.parses = 0
+
+    def _check_root(self):
+        if not self._root_checked:
+            private_dir(self.root)
+            self._root_checked = True
+
+    def blob_path(self, digest):
+        return os.path.join(self.root, "blobs", digest)
+
+    def _artifact_path(self, kind, digest):
+        return os.path.join(self.root, "artifacts", f"v{ARTIFACT_VERSION}", kind, f"{digest}.pkl")
+
+    def _evict(self, keep):
+        # old artifact versions go first; see score_utils.evict_lru
+        artifacts = os.path.join(self.root, "artifacts")
+        current = os.path.join(artifacts, f"v{ARTIFACT_VERSION}")
+        evict_lru(self.root, self.max_bytes, keep,
+                  is_stale=lambda d: d.startswith(artifacts) and not d.startswith(current))
+
+    def _remember(self, key, df):
+        with self._lock:
+            self._artifacts[key] = df
+            self._artifacts.move_to_end(key)
+            while len(self._artifacts) > self.memory_items:
+                self._artifacts.popitem(last=False)
+
+    def put_bytes(self, data, count=True):
+        """Store raw bytes once; return their hash."""
+        self._check_root()
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(digest)
+        duplicate = os.path.exists(path)
+        if duplicate:
+            os.utime(path)
+        else:
+            _atomic_write(path, lambda f: f.write(data))
+            self._evict(keep=path)
+        if not count:
+            return digest
+        with self._lock:
+            self.uploads += 1
+            self.bytes_received += len(data)
+            if duplicate:
+                self.duplicate_uploads += 1
+                self.bytes_saved += len(data)
+        return digest
+
+    def load_bytes(self, data, kind, count=True):
+        """Return the parsed artifact of `kind` for these bytes (a fresh copy the caller may modify)."""
+        if kind not in PARSERS:
+            raise ValueError(f"Unknown upload kind: {kind!r}")
+        digest = self.put_bytes(data, count=count)
+        key = (kind, digest)
+
+        with self._lock:
+            df = self._artifacts.get(key)
+            if df is not None:
+                self._artifacts.move_to_end(key)
+        if df is None:
+            path = self._artifact_path(kind, digest)
+            if os.path.exists(path):
+                os.utime(path)
+                df = pd.read_pickle(path)
+            else:
+                df = PARSERS[kind](data)
+                with self._lock:
+                    self.parses += 1
+                if df is None:
+                    return None
+                _atomic_write(path, lambda f: df.to_pickle(f))
+                self._evict(keep=path)
+            self._remember(key, df)
+        return df.copy()
+
+    def load(self, uploaded_file, kind):
+        # accepts a Streamlit UploadedFile (or any object with getvalue())
+        if uploaded_file is None:
+            return None
+        # the uploader hands back the same file on every rerun; only count it once
+        file_id = getattr(uploaded_file, "file_id", None) or getattr(uploaded_file, "id", None) or id(uploaded_file)
+        with self._lock:
+            count = file_id not in self._seen_files
+            self._seen_files[file_id] = True
+            while len(self._seen_files) > 4096:
+                self._seen_files.popitem(last=False)
+        return self.load_bytes(uploaded_file.getvalue(), kind, count=count)
+
+    def stats(self):
+        with self._lock:
+            unique = self.uploads - self.duplicate_uploads
+            return {
+                "uploads": self.uploads,
+                "unique_uploads": unique,
+                "dedupe_ratio": self.uploads / unique if unique else 1.0,
+                "bytes_received": self.bytes_received,
+                "bytes_saved": self.bytes_saved,
+                "parses": self.parses,
+            }
+
+    def stats_text(self):
+        s = self.stats()
+        return (f"Upload store: {s['uploads']} uploads, {s['unique_uploads']} unique "
+                f"(dedupe ratio {s['dedupe_ratio']:.2f}x), {s['bytes_saved'] / 1024:.1f} KiB saved, "
+                f"{s['parses']} parses")
+
+upload_store = UploadStore()